@@ -1,57 +1,253 @@
 #!/usr/bin/env python3
 
-from argparse import Action, ArgumentParser
-from typing import Callable, Any, Union, List
-from sys import stderr
+from argparse import Action, ArgumentParser, ArgumentTypeError
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Any, Union, List, Iterator, Dict, Tuple, Optional
+from sys import intern
+import sys
 
+_MISSING = object()
 
-def promptor(
+_CONVERSION_ERROR = 'Could not convert the inputted value to its specified type.'
+_CONVERSION_ERROR_MESSAGE = f'{_CONVERSION_ERROR} Try again.\n'
+
+# The number of required arguments and whether the value is a list, for each non-integer `nargs` value.
+_NARGS_TABLE = {
+    None: (1, False),
+    '?': (0, False),
+    '*': (0, True),
+    '+': (1, True)
+}
+
+
+def _iter_parts(value: str, separator: str = ', ') -> Iterator[str]:
+    """
+    Iterate over the separator-delimited parts of a string without building an intermediate list.
+
+    :param value: The string whose parts to iterate over.
+    :param separator: The separator delimiting the parts.
+    :return: An iterator of the parts of the string.
+    """
+
+    position = 0
+    separator_length = len(separator)
+    while True:
+        separator_index = value.find(separator, position)
+        if separator_index < 0:
+            yield value[position:]
+            return
+        yield value[position:separator_index]
+        position = separator_index + separator_length
+
+
+def _read_input(prompt: str) -> str:
+    """
+    Prompt for and read a line of input for a parameter.
+
+    :param prompt: The prompt to be shown for the parameter whose value to be input.
+    :return: The inputted line, stripped of surrounding whitespace.
+    """
+
+    # Make sure any pending error messages are shown before the prompt, and that the prompt is shown before blocking on
+    # the read. The streams are looked up on each call, like `input` does, so that replaced streams are used.
+    sys.stderr.flush()
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n').strip()
+
+
+def _promptor_scalar(
     parameter_name: str,
     type_converter: Callable[[str], Any],
-    use_list: bool,
     num_required_args: int
-) -> Union[List[Any], Any]:
+) -> Any:
     """
-    Prompt for input for a parameter.
+    Prompt for input for a parameter whose value is a single value.
 
     :param parameter_name: The name of the parameter whose value to be input.
-    :param type_converter: A type converter for the parameter to be applied to the inputted values.
-    :param use_list: Whether the value resulting from the input should be a a list.
+    :param type_converter: A type converter for the parameter to be applied to the inputted value.
     :param num_required_args: The number of arguments the parameter requires, and one must input.
-    :return: A single type converted inputted value or a list of inputted type converted values.
+    :return: A type converted inputted value.
     """
 
+    prompt = f'{parameter_name}: '
+    # When the input is not interactive, e.g. piped, nobody can correct invalid input, so fail rather than retry.
+    interactive = sys.stdin.isatty()
+
     full_value = None
     while not full_value:
         inputted_value = None
         while not inputted_value:
-            inputted_value = input(f'{parameter_name}: ').strip()
-            if use_list and len(inputted_value.split(', ')) != num_required_args:
-                print(f'Incorrect number of arguments provided. Need {num_required_args}. Try again.', file=stderr)
+            inputted_value = _read_input(prompt)
+            if not inputted_value and num_required_args == 0:
+                return ''
+
+        try:
+            full_value = type_converter(inputted_value)
+        except (ArgumentTypeError, TypeError, ValueError) as e:
+            if not interactive:
+                # Like argparse, report the message of an `ArgumentTypeError` raised by the type converter as is.
+                if isinstance(e, ArgumentTypeError):
+                    raise
+                raise ArgumentTypeError(_CONVERSION_ERROR) from e
+            sys.stderr.write(_CONVERSION_ERROR_MESSAGE)
+            continue
+
+    return full_value
+
+
+def _promptor_list(
+    parameter_name: str,
+    type_converter: Callable[[str], Any],
+    num_required_args: int,
+    parallel_convert_threshold: Optional[int] = None
+) -> List[Any]:
+    """
+    Prompt for input for a parameter whose value is a list.
+
+    :param parameter_name: The name of the parameter whose value to be input.
+    :param type_converter: A type converter for the parameter to be applied to each of the inputted values.
+    :param num_required_args: The number of arguments the parameter requires, and one must input.
+    :param parallel_convert_threshold: The number of inputted values from which they are converted concurrently, on
+        threads. `None` always converts them sequentially.
+    :return: A list of inputted type converted values.
+    """
+
+    # Keep the successful conversions of a failed attempt, so that elements that are input again on a retry are not
+    # re-converted. Each kept conversion is used at most once, so that no two elements of a value share an object.
+    retry_conversions: Dict[str, Any] = {}
+    attempt_conversions: List[Tuple[str, Any]] = []
+
+    def convert_element(element: str) -> Any:
+        converted_element = retry_conversions.pop(element, _MISSING)
+        if converted_element is _MISSING:
+            converted_element = type_converter(element)
+        attempt_conversions.append((element, converted_element))
+        return converted_element
+
+    prompt = f'{parameter_name}: '
+    count_error = f'Incorrect number of arguments provided. Need {num_required_args}.'
+    count_error_message = f'{count_error} Try again.\n'
+    # When the input is not interactive, e.g. piped, nobody can correct invalid input, so fail rather than retry.
+    interactive = sys.stdin.isatty()
+
+    full_value = None
+    while not full_value:
+        inputted_value = None
+        while not inputted_value:
+            inputted_value = _read_input(prompt)
+            if inputted_value.count(', ') + 1 != num_required_args:
+                if not interactive and num_required_args != 0:
+                    raise ArgumentTypeError(count_error)
+                sys.stderr.write(count_error_message)
                 inputted_value = None
             if not inputted_value and num_required_args == 0:
                 return ''
 
+        attempt_conversions.clear()
         try:
-            if use_list:
-                full_value = [
-                    type_converter(inputted_value_element)
-                    for inputted_value_element in inputted_value.split(', ')
-                ]
+            # The inputted values are already strings, so there is nothing to convert.
+            if type_converter is str:
+                full_value = list(_iter_parts(inputted_value))
+            # The number of inputted values equals `num_required_args` at this point. If opted into, convert many values
+            # concurrently, which overlaps the latency of type converters that perform I/O.
+            elif parallel_convert_threshold is not None and num_required_args >= parallel_convert_threshold:
+                with ThreadPoolExecutor(max_workers=min(8, num_required_args)) as executor:
+                    full_value = list(executor.map(convert_element, _iter_parts(inputted_value)))
             else:
-                full_value = type_converter(inputted_value)
-        except:
-            print(f'Could not convert the inputted value to its specified type. Try again.', file=stderr)
+                full_value = list(map(convert_element, _iter_parts(inputted_value)))
+        except (ArgumentTypeError, TypeError, ValueError) as e:
+            if not interactive:
+                # Like argparse, report the message of an `ArgumentTypeError` raised by the type converter as is.
+                if isinstance(e, ArgumentTypeError):
+                    raise
+                raise ArgumentTypeError(_CONVERSION_ERROR) from e
+            sys.stderr.write(_CONVERSION_ERROR_MESSAGE)
+            retry_conversions.update(attempt_conversions)
             continue
 
     return full_value
 
 
-class PromptArgumentParserAction(Action):
-    def __init__(self, **kwargs):
+def promptor(
+    parameter_name: str,
+    type_converter: Callable[[str], Any],
+    use_list: bool,
+    num_required_args: int
+) -> Union[List[Any], Any]:
+    """
+    Prompt for input for a parameter.
+
+    :param parameter_name: The name of the parameter whose value to be input.
+    :param type_converter: A type converter for the parameter to be applied to the inputted values.
+    :param use_list: Whether the value resulting from the input should be a a list.
+    :param num_required_args: The number of arguments the parameter requires, and one must input.
+    :return: A single type converted inputted value or a list of inputted type converted values.
+    """
+
+    return (_promptor_list if use_list else _promptor_scalar)(parameter_name, type_converter, num_required_args)
+
+
+def _make_type(
+    parameter_name: str,
+    type_converter: Callable[[str], Any],
+    prompt_function: Callable[[str, Callable[[str], Any], int], Union[List[Any], Any]],
+    num_required_args: int
+) -> Callable[[str], Any]:
+    """
+    Make a type converter that uses a provided value if there is one and otherwise prompts for it.
+
+    :param parameter_name: The name of the parameter whose value to be input.
+    :param type_converter: A type converter for the parameter to be applied to the inputted values.
+    :param prompt_function: The function with which to prompt for the value, either for a single value or a list.
+    :param num_required_args: The number of arguments the parameter requires, and one must input.
+    :return: A type converter to be used in place of the user-provided one.
+    """
+
+    def _type(
+        value: str,
+        _parameter_name: str = parameter_name,
+        _type_converter: Callable[[str], Any] = type_converter,
+        _prompt_function: Callable[[str, Callable[[str], Any], int], Union[List[Any], Any]] = prompt_function,
+        _num_required_args: int = num_required_args
+    ) -> Union[List[Any], Any]:
+        return value if value else _prompt_function(_parameter_name, _type_converter, _num_required_args)
 
-        self.provided_restored = False
+    return _type
+
+
+class PromptArgumentParserAction(Action):
+    # `Action` does not define `__slots__`, so instances keep a `__dict__` for its attributes; the attributes specific
+    # to this action are however stored in slots.
+    __slots__ = (
+        '_state',
+        '_argument_name',
+        '_parameter_name',
+        '_required',
+        '_nargs',
+        '_type',
+        '_default',
+        '_num_required_args',
+        '_prompt_function',
+        '_c_required',
+        '_c_nargs',
+        '_c_type',
+        '_c_default'
+    )
+
+    # The states of which `add_argument` arguments are in effect.
+    CRAFTED_STATE = 0
+    PROVIDED_STATE = 1
+
+    def __init__(self, parallel_convert_threshold: Optional[int] = None, **kwargs):
+
+        self._state = self.CRAFTED_STATE
         self._argument_name = next(iter(kwargs['option_strings'])) if kwargs.get('option_strings') else kwargs['dest']
+        self._parameter_name = intern(kwargs['dest'])
 
         # Save the user-provided `add_argument` arguments in order to have `print_usage` and `print_help` print their
         # messages in the correct format.
@@ -60,23 +256,28 @@ class PromptArgumentParserAction(Action):
         self._type = kwargs.get('type')
         self._default = kwargs.get('default')
 
-        # Let the prompter know how many arguments are required for this parameter. Also, because `nargs` is overwritten
-        # we must also check that the number of user-provided arguments is correct.
-        if self._nargs in {'*', '?'}:
-            self._num_required_args = 0
-        elif self._nargs == '+':
-            self._num_required_args = 1
-        else:
-            self._num_required_args = int(self._nargs or '1')
+        # Let the prompter know how many arguments are required for this parameter and whether the value is a list.
+        # Also, because `nargs` is overwritten we must also check that the number of user-provided arguments is correct.
+        nargs_spec = _NARGS_TABLE.get(self._nargs) if not isinstance(self._nargs, int) else None
+        if nargs_spec is None:
+            num_required_args = int(self._nargs)
+            nargs_spec = (num_required_args, num_required_args > 1)
+        self._num_required_args, use_list = nargs_spec
 
         # Specify whether the parsed value will result in a list. Using "*" and "?" assures providing a value for the
         # parameter is optional, so that the providing can be handled by the prompt.
         kwargs['nargs'] = '*' if self._num_required_args > 1 else '?'
-        # In case an argument value is provided via the terminal, use it. Otherwise, prompt.
-        kwargs['type'] = lambda value: value if value else promptor(
-            parameter_name=kwargs['dest'],
-            type_converter=kwargs.get('type', str),
-            use_list=self._nargs != '?' and self._nargs in {'*', '+'} or int(self._nargs or '1') > 1,
+        # In case an argument value is provided via the terminal, use it. Otherwise, prompt. Whether to prompt for a
+        # list or a single value and which type converter to apply are resolved once here rather than on every
+        # invocation.
+        self._prompt_function = (
+            partial(_promptor_list, parallel_convert_threshold=parallel_convert_threshold) if use_list
+            else _promptor_scalar
+        )
+        kwargs['type'] = _make_type(
+            parameter_name=self._parameter_name,
+            type_converter=self._type or str,
+            prompt_function=self._prompt_function,
             num_required_args=self._num_required_args
         )
         # From the Python documentation (https://docs.python.org/3/library/argparse.html#default):
@@ -91,13 +292,23 @@ class PromptArgumentParserAction(Action):
 
         # Save the crafted `add_argument` arguments in case `print_usage` or `print_help` is called in between this
         # action registration and `parse_args`.
-        self.__required = kwargs['required']
-        self.__nargs = kwargs['nargs']
-        self.__type = kwargs['type']
-        self.__default = kwargs['default']
+        self._c_required = kwargs['required']
+        self._c_nargs = kwargs['nargs']
+        self._c_type = kwargs['type']
+        self._c_default = kwargs['default']
 
         super().__init__(**kwargs)
 
+    @property
+    def provided_restored(self) -> bool:
+        """
+        Whether the user-provided `add_argument` arguments are in effect.
+
+        :return: `True` if the user-provided arguments are in effect, `False` if the crafted ones are.
+        """
+
+        return self._state == self.PROVIDED_STATE
+
     def restore_provided(self) -> None:
         """
         Restort the user-provided `add_argument` arguments.
@@ -107,10 +318,14 @@ class PromptArgumentParserAction(Action):
         :return:
         """
 
+        if self._state == self.PROVIDED_STATE:
+            return
+
         self.required = self._required
         self.nargs = self._nargs
         self.type = self._type
         self.default = self._default
+        self._state = self.PROVIDED_STATE
 
     def restore_crafted(self) -> None:
         """
@@ -121,10 +336,14 @@ class PromptArgumentParserAction(Action):
         :return:
         """
 
-        self.required = self.__required
-        self.nargs = self.__nargs
-        self.type = self.__type
-        self.default = self.__default
+        if self._state == self.CRAFTED_STATE:
+            return
+
+        self.required = self._c_required
+        self.nargs = self._c_nargs
+        self.type = self._c_type
+        self.default = self._c_default
+        self._state = self.CRAFTED_STATE
 
     def __call__(self, parser, namespace, result_value, option_string=None):
 
@@ -138,30 +357,52 @@ class PromptArgumentParserAction(Action):
 
 
 class PromptArgumentParser(ArgumentParser):
+    # The number of inputted list values from which their type conversions are performed concurrently, on threads. Only
+    # enable this for thread-safe type converters that release the GIL, e.g. ones performing I/O. `None` disables it.
+    parallel_convert_threshold: Optional[int] = None
 
     def add_argument(self, *args, **kwargs):
-        if (kwargs.get('required') or not next(iter(args)).startswith('-')) and 'default' not in kwargs:
+        # Arguments with a default value are never prompted for.
+        if 'default' in kwargs:
+            return super().add_argument(*args, **kwargs)
+
+        first_arg = args[0] if args else ''
+        if kwargs.get('required') or not first_arg.startswith('-'):
             kwargs['action'] = PromptArgumentParserAction
-        super().add_argument(*args, **kwargs)
+            kwargs['parallel_convert_threshold'] = self.parallel_convert_threshold
+        return super().add_argument(*args, **kwargs)
 
-    def print_help(self, file=None):
-        for action in self._actions:
-            if isinstance(action, PromptArgumentParserAction) and not action.provided_restored:
-                action.restore_provided()
+    def _pending_prompt_actions(self) -> List[PromptArgumentParserAction]:
+        """
+        Retrieve the prompt actions whose crafted `add_argument` arguments are in effect.
+
+        :return: The prompt actions whose user-provided arguments are to be restored while printing.
+        """
+
+        return [
+            action for action in self._actions
+            if isinstance(action, PromptArgumentParserAction)
+            and action._state == PromptArgumentParserAction.CRAFTED_STATE
+        ]
 
-        super().print_help(file)
+    def print_help(self, file=None):
+        pending_actions = self._pending_prompt_actions()
+        for action in pending_actions:
+            action.restore_provided()
 
-        for action in self._actions:
-            if isinstance(action, PromptArgumentParserAction) and not action.provided_restored:
+        try:
+            super().print_help(file)
+        finally:
+            for action in pending_actions:
                 action.restore_crafted()
 
     def print_usage(self, file=None):
-        for action in self._actions:
-            if isinstance(action, PromptArgumentParserAction) and not action.provided_restored:
-                action.restore_provided()
-
-        super().print_usage(file)
+        pending_actions = self._pending_prompt_actions()
+        for action in pending_actions:
+            action.restore_provided()
 
-        for action in self._actions:
-            if isinstance(action, PromptArgumentParserAction) and not action.provided_restored:
+        try:
+            super().print_usage(file)
+        finally:
+            for action in pending_actions:
                 action.restore_crafted()